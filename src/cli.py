@@ -5,7 +5,9 @@ import yaml
 
 from src.data_sources.commoncrawl import (
     download_from_manifest,
+    find_latest_ledger,
     find_latest_manifest,
+    recap_ledger,
     sample_and_write_manifest,
     scan_wet_files,
     validate_counts,
@@ -35,6 +37,22 @@ def main() -> None:
     p_scan = sub.add_parser("cc-scan", help="Scan downloaded WET files")
     p_scan.add_argument("--config", default="configs/pilot.yaml")
 
+    p_recap = sub.add_parser(
+        "cc-recap", help="Re-apply domain cap and summaries from a scan ledger"
+    )
+    p_recap.add_argument("--config", default="configs/pilot.yaml")
+    p_recap.add_argument(
+        "--ledger",
+        help="Path to scan ledger parquet (defaults to latest in out_dir)",
+        default=None,
+    )
+    p_recap.add_argument(
+        "--domain-cap",
+        type=int,
+        help="Per-crawl domain cap (defaults to filters.domain_cap)",
+        default=None,
+    )
+
     p_export = sub.add_parser("cc-export", help="Export pilot scan tables/figures")
     p_export.add_argument("--config", default="configs/pilot.yaml")
 
@@ -61,6 +79,17 @@ def main() -> None:
         scan_wet_files(cfg, cfg_path)
         return
 
+    if args.command == "cc-recap":
+        interim_dir = Path(cfg.get("project", {}).get("out_dir", "data/interim"))
+        ledger_path = Path(args.ledger) if args.ledger else None
+        if ledger_path is None:
+            ledger_path = find_latest_ledger(interim_dir)
+        if ledger_path is None:
+            print(f"No scan ledger found in {interim_dir}. Run cc-scan first.")
+            sys.exit(1)
+        recap_ledger(cfg, ledger_path, args.domain_cap)
+        return
+
     if args.command == "cc-export":
         interim_dir = Path(cfg.get("project", {}).get("out_dir", "data/interim"))
         reports_dir = Path("reports")
@@ -1,3 +1,5 @@
+from .cc_docstore import DocStoreReader, DocStoreWriter
+from .cc_ledger import apply_domain_cap, find_latest_ledger, recap_ledger, summarize_ledger
 from .cc_pipeline import (
     download_from_manifest,
     find_latest_manifest,
@@ -7,9 +9,15 @@ from .cc_pipeline import (
 from .cc_scan import scan_wet_files
 
 __all__ = [
+    "DocStoreReader",
+    "DocStoreWriter",
+    "apply_domain_cap",
     "download_from_manifest",
+    "find_latest_ledger",
     "find_latest_manifest",
+    "recap_ledger",
     "sample_and_write_manifest",
-    "validate_counts",
     "scan_wet_files",
+    "summarize_ledger",
+    "validate_counts",
 ]
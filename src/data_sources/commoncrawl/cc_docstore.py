@@ -0,0 +1,186 @@
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+
+DOC_STORE_CODEC = "zstd"
+DEFAULT_BLOCK_BYTES = 1024 * 1024
+DEFAULT_COMPRESSION_LEVEL = 3
+
+INDEX_COLUMNS = [
+    "source_wet",
+    "url",
+    "record_ordinal",
+    "matched_term",
+    "block_offset",
+    "block_size",
+    "block_raw_size",
+    "doc_offset",
+    "doc_len",
+]
+
+DocKey = Tuple[int, str]
+UrlKey = Tuple[str, str, str]
+DocLocation = Tuple[int, int, int, int, int]
+
+
+class DocStoreWriter:
+    """Append hit-document text to zstd blocks indexed by (record_ordinal, matched_term)."""
+
+    def __init__(
+        self,
+        blocks_path: Path,
+        index_path: Path,
+        block_bytes: int = DEFAULT_BLOCK_BYTES,
+        compression_level: int = DEFAULT_COMPRESSION_LEVEL,
+    ) -> None:
+        self.blocks_path = blocks_path
+        self.index_path = index_path
+        self.block_bytes = block_bytes
+        self._codec = pa.Codec(DOC_STORE_CODEC, compression_level=compression_level)
+
+        self.blocks_path.parent.mkdir(parents=True, exist_ok=True)
+        self._stream = self.blocks_path.open("wb")
+        self._offset = 0
+        self._buffer: List[bytes] = []
+        self._buffer_len = 0
+        self._pending: List[Tuple[str, str, int, str, int, int]] = []
+        self._index_rows: List[Dict] = []
+        self.docs_written = 0
+
+    def add(
+        self,
+        source_wet: str,
+        url: str,
+        record_ordinal: int,
+        matched_terms: List[str],
+        text: str,
+    ) -> None:
+        payload = text.encode("utf-8")
+        doc_offset = self._buffer_len
+        self._buffer.append(payload)
+        self._buffer_len += len(payload)
+        self.docs_written += 1
+        for term in matched_terms:
+            self._pending.append((source_wet, url, record_ordinal, term, doc_offset, len(payload)))
+
+        if self._buffer_len >= self.block_bytes:
+            self._flush_block()
+
+    def _flush_block(self) -> None:
+        if not self._buffer:
+            return
+        raw = b"".join(self._buffer)
+        compressed = self._codec.compress(raw, asbytes=True)
+        self._stream.write(compressed)
+
+        for source_wet, url, record_ordinal, term, doc_offset, doc_len in self._pending:
+            self._index_rows.append(
+                {
+                    "source_wet": source_wet,
+                    "url": url,
+                    "record_ordinal": record_ordinal,
+                    "matched_term": term,
+                    "block_offset": self._offset,
+                    "block_size": len(compressed),
+                    "block_raw_size": len(raw),
+                    "doc_offset": doc_offset,
+                    "doc_len": doc_len,
+                }
+            )
+
+        self._offset += len(compressed)
+        self._buffer = []
+        self._buffer_len = 0
+        self._pending = []
+
+    def close(self) -> None:
+        self._flush_block()
+        self._stream.close()
+        df = pd.DataFrame(self._index_rows, columns=INDEX_COLUMNS)
+        df.to_parquet(self.index_path, index=False)
+
+    def abort(self) -> None:
+        self._stream.close()
+        self.blocks_path.unlink(missing_ok=True)
+        self.index_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "DocStoreWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class DocStoreReader:
+    """Random-access lookup of hit-document text written by DocStoreWriter."""
+
+    def __init__(self, blocks_path: Path, index_path: Path) -> None:
+        self.blocks_path = blocks_path
+        self._codec = pa.Codec(DOC_STORE_CODEC)
+        index = pd.read_parquet(index_path)
+        self._index: Dict[DocKey, DocLocation] = {}
+        self._by_url: Dict[UrlKey, List[DocKey]] = {}
+        for row in index.itertuples(index=False):
+            key = (int(row.record_ordinal), row.matched_term)
+            if key in self._index:
+                raise ValueError(f"Duplicate doc store key {key} in {index_path}")
+            self._index[key] = (
+                int(row.block_offset),
+                int(row.block_size),
+                int(row.block_raw_size),
+                int(row.doc_offset),
+                int(row.doc_len),
+            )
+            self._by_url.setdefault((row.source_wet, row.url, row.matched_term), []).append(key)
+        self._stream = self.blocks_path.open("rb")
+        self._cached_offset: Optional[int] = None
+        self._cached_block = b""
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: DocKey) -> bool:
+        return key in self._index
+
+    def _read_block(self, offset: int, size: int, raw_size: int) -> bytes:
+        if offset != self._cached_offset:
+            self._stream.seek(offset)
+            compressed = self._stream.read(size)
+            self._cached_block = self._codec.decompress(
+                compressed, decompressed_size=raw_size, asbytes=True
+            )
+            self._cached_offset = offset
+        return self._cached_block
+
+    def get_text(self, record_ordinal: int, matched_term: str) -> str:
+        key = (int(record_ordinal), matched_term)
+        if key not in self._index:
+            raise KeyError(f"No stored document for {key}")
+        block_offset, block_size, raw_size, doc_offset, doc_len = self._index[key]
+        block = self._read_block(block_offset, block_size, raw_size)
+        return block[doc_offset : doc_offset + doc_len].decode("utf-8")
+
+    def get_text_by_url(self, source_wet: str, url: str, matched_term: str) -> str:
+        url_key = (source_wet, url, matched_term)
+        keys = self._by_url.get(url_key, [])
+        if not keys:
+            raise KeyError(f"No stored document for {url_key}")
+        if len(keys) > 1:
+            raise ValueError(
+                f"{url_key} matches {len(keys)} stored documents; use get_text(record_ordinal, ...)"
+            )
+        return self.get_text(*keys[0])
+
+    def close(self) -> None:
+        self._stream.close()
+
+    def __enter__(self) -> "DocStoreReader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -0,0 +1,156 @@
+import csv
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .cc_pipeline import _setup_logger
+
+LEDGER_COLUMNS = ["crawl_id", "registered_domain", "matched_term", "record_ordinal"]
+LEDGER_CATEGORY_COLUMNS = ["crawl_id", "registered_domain", "matched_term"]
+TOP_DOMAINS_N = 25
+
+
+def ledger_paths(out_dir: Path, runid: str) -> Tuple[Path, Path]:
+    return (
+        out_dir / f"cc_scan_ledger_{runid}.parquet",
+        out_dir / f"cc_scan_doc_counts_{runid}.json",
+    )
+
+
+def ledger_from_columns(ledger_cols: Dict[str, List]) -> pd.DataFrame:
+    ledger = pd.DataFrame(ledger_cols, columns=LEDGER_COLUMNS)
+    ledger = ledger.astype({col: "category" for col in LEDGER_CATEGORY_COLUMNS})
+    return ledger.astype({"record_ordinal": "int64"})
+
+
+def _in_encounter_order(ledger: pd.DataFrame) -> pd.DataFrame:
+    if ledger["record_ordinal"].is_monotonic_increasing:
+        return ledger
+    return ledger.sort_values("record_ordinal", kind="stable")
+
+
+def write_ledger(
+    ledger: pd.DataFrame, doc_counts: Dict[str, int], out_dir: Path, runid: str
+) -> Tuple[Path, Path]:
+    ledger_path, counts_path = ledger_paths(out_dir, runid)
+    ledger.to_parquet(ledger_path, index=False)
+    counts_path.write_text(json.dumps(doc_counts) + "\n", encoding="utf-8")
+    return ledger_path, counts_path
+
+
+def read_ledger(ledger_path: Path) -> Tuple[pd.DataFrame, Dict[str, int]]:
+    runid = ledger_path.name[len("cc_scan_ledger_") : -len(".parquet")]
+    _, counts_path = ledger_paths(ledger_path.parent, runid)
+    ledger = pd.read_parquet(ledger_path, columns=LEDGER_COLUMNS)
+    doc_counts = json.loads(counts_path.read_text(encoding="utf-8"))
+    return ledger, doc_counts
+
+
+def find_latest_ledger(interim_dir: Path) -> Optional[Path]:
+    if not interim_dir.exists():
+        return None
+    ledgers = sorted(interim_dir.glob("cc_scan_ledger_*.parquet"))
+    if not ledgers:
+        return None
+    return ledgers[-1]
+
+
+def apply_domain_cap(ledger: pd.DataFrame, domain_cap: int) -> pd.Series:
+    """Mask keeping the first ``domain_cap`` matches per (crawl, domain) in scan order."""
+    ordered = _in_encounter_order(ledger)
+    rank = ordered.groupby(["crawl_id", "registered_domain"], sort=False, observed=True).cumcount()
+    kept = (rank < domain_cap) | (ordered["registered_domain"] == "")
+    if ordered is ledger:
+        return kept
+    return kept.reindex(ledger.index)
+
+
+def summarize_ledger(
+    ledger: pd.DataFrame, doc_counts: Dict[str, int], domain_cap: int
+) -> Tuple[List[Tuple[str, object]], pd.DataFrame]:
+    ordered = _in_encounter_order(ledger)
+    kept = ordered[apply_domain_cap(ordered, domain_cap)]
+    kept_domains = kept.loc[kept["registered_domain"] != "", "registered_domain"]
+
+    hits_by_term = kept.groupby("matched_term", sort=False, observed=True).size()
+    top_domains = (
+        kept_domains.groupby(kept_domains, sort=False, observed=True)
+        .size()
+        .sort_values(ascending=False, kind="stable")
+        .head(TOP_DOMAINS_N)
+        .rename_axis("registered_domain")
+        .reset_index(name="hits")
+    )
+
+    metrics: List[Tuple[str, object]] = [
+        ("docs_scanned", int(doc_counts["docs_scanned"])),
+        ("docs_minlen", int(doc_counts["docs_minlen"])),
+        ("hits_total", len(kept)),
+        ("hits_by_term", json.dumps({k: int(v) for k, v in hits_by_term.items()})),
+        ("unique_domains_total", int(doc_counts["unique_domains_total"])),
+        ("unique_domains_hits", int(kept_domains.nunique())),
+        ("capped_removed", len(ordered) - len(kept)),
+        ("domain_cap", domain_cap),
+    ]
+    return metrics, top_domains
+
+
+def write_summary_outputs(
+    metrics: List[Tuple[str, object]],
+    top_domains: pd.DataFrame,
+    summary_path: Path,
+    top_domains_path: Path,
+) -> Tuple[Path, Path]:
+    with summary_path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["metric", "value"])
+        for metric, value in metrics:
+            writer.writerow([metric, value])
+        writer.writerow(["top_domains_csv", str(top_domains_path)])
+
+    with top_domains_path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["registered_domain", "hits"])
+        for domain, count in top_domains.itertuples(index=False):
+            writer.writerow([domain, count])
+    return summary_path, top_domains_path
+
+
+def recap_ledger(config: Dict, ledger_path: Path, domain_cap: Optional[int] = None) -> Path:
+    runid = time.strftime("%Y%m%d_%H%M%S", time.gmtime())
+    logger = _setup_logger(Path("reports/logs"), "cc-recap")
+
+    if domain_cap is None:
+        domain_cap = int(config["filters"]["domain_cap"])
+    out_dir = Path(config.get("project", {}).get("out_dir", "data/interim"))
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    logger.info("Loading ledger %s", ledger_path)
+    logger.info("Domain cap: %d", domain_cap)
+    ledger, doc_counts = read_ledger(ledger_path)
+
+    metrics, top_domains = summarize_ledger(ledger, doc_counts, domain_cap)
+    metrics.append(("ledger_parquet", str(ledger_path)))
+    # Distinct names keep cc-export on the scan outputs, which match the corpus cap.
+    summary_path, top_domains_path = write_summary_outputs(
+        metrics,
+        top_domains,
+        out_dir / f"cc_recap_summary_{runid}_cap{domain_cap}.csv",
+        out_dir / f"cc_recap_top_domains_{runid}_cap{domain_cap}.csv",
+    )
+
+    logger.info("Wrote summary %s", summary_path)
+    logger.info("Wrote top domains %s", top_domains_path)
+
+    values = dict(metrics)
+    print(
+        "Recap complete: "
+        f"matches={len(ledger)}, "
+        f"domain_cap={domain_cap}, "
+        f"hits_total={values['hits_total']}, "
+        f"capped_removed={values['capped_removed']}"
+    )
+    return summary_path
@@ -1,10 +1,8 @@
-import csv
 import gzip
-import json
 import logging
 import re
 import time
-from collections import Counter, defaultdict
+from collections import defaultdict
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Tuple
 
@@ -13,6 +11,15 @@ import tempfile
 import tldextract
 from warcio.archiveiterator import ArchiveIterator
 
+from .cc_docstore import DEFAULT_BLOCK_BYTES, DEFAULT_COMPRESSION_LEVEL, DocStoreWriter
+from .cc_ledger import (
+    LEDGER_COLUMNS,
+    ledger_from_columns,
+    summarize_ledger,
+    write_ledger,
+    write_summary_outputs,
+)
+
 
 def _utc_runid() -> str:
     return time.strftime("%Y%m%d_%H%M%S", time.gmtime())
@@ -133,90 +140,114 @@ def scan_wet_files(config: Dict, config_path: Path) -> Path:
     if not wet_files:
         raise FileNotFoundError("No .wet.gz files found in data/raw/wet")
 
+    out_dir = Path(config.get("project", {}).get("out_dir", "data/interim"))
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    doc_store_cfg = config.get("doc_store", {}) or {}
+    doc_store: Optional[DocStoreWriter] = None
+    if doc_store_cfg.get("enabled", False):
+        doc_store = DocStoreWriter(
+            out_dir / f"cc_hit_docs_{runid}.zst",
+            out_dir / f"cc_hit_docs_index_{runid}.parquet",
+            block_bytes=int(doc_store_cfg.get("block_bytes", DEFAULT_BLOCK_BYTES)),
+            compression_level=int(
+                doc_store_cfg.get("compression_level", DEFAULT_COMPRESSION_LEVEL)
+            ),
+        )
+        logger.info("Doc store: %s", doc_store.blocks_path)
+
     docs_scanned = 0
     docs_minlen = 0
-    hits_total = 0
-    capped_removed = 0
-    hits_by_term: Counter = Counter()
     domains_total: set[str] = set()
-    domains_hits: set[str] = set()
-    domain_hit_counts: Dict[Tuple[str, str], int] = defaultdict(int)
-    top_domains_counter: Counter = Counter()
 
+    # The ledger stays uncapped; the counter only bounds the corpus rows held in memory.
+    ledger_cols: Dict[str, List] = {col: [] for col in LEDGER_COLUMNS}
+    domain_hit_counts: Dict[Tuple[str, str], int] = defaultdict(int)
     hit_rows: List[Dict[str, str]] = []
 
-    for wet_path in wet_files:
-        source_wet = wet_path.name
-        crawl_id = source_wet.split("_")[0]
-        logger.info("Scanning %s", wet_path)
-
-        for url, warc_date, text in iter_wet_records(wet_path):
-            docs_scanned += 1
-            text_len = len(text)
-            if text_len < min_chars:
-                continue
-            docs_minlen += 1
-
-            domain = extract_registered_domain(url)
-            if domain:
-                domains_total.add(domain)
-
-            matches = find_term_matches(text, patterns, asd_pattern, asd_window)
-            if not matches:
-                continue
-
-            for label, span in matches:
+    try:
+        for wet_path in wet_files:
+            source_wet = wet_path.name
+            crawl_id = source_wet.split("_")[0]
+            logger.info("Scanning %s", wet_path)
+
+            for url, warc_date, text in iter_wet_records(wet_path):
+                record_ordinal = docs_scanned
+                docs_scanned += 1
+                text_len = len(text)
+                if text_len < min_chars:
+                    continue
+                docs_minlen += 1
+
+                domain = extract_registered_domain(url)
                 if domain:
-                    key = (crawl_id, domain)
-                    if domain_hit_counts[key] >= domain_cap:
-                        capped_removed += 1
-                        continue
-                    domain_hit_counts[key] += 1
-
-                hits_total += 1
-                hits_by_term[label] += 1
-                if domain:
-                    domains_hits.add(domain)
-                    top_domains_counter[domain] += 1
-
-                hit_rows.append(
-                    {
-                        "crawl_id": crawl_id,
-                        "source_wet": source_wet,
-                        "url": url or "",
-                        "registered_domain": domain,
-                        "warc_date": warc_date or "",
-                        "matched_term": label,
-                        "context_snippet": _context_snippet(text, span, asd_window),
-                        "text_len": text_len,
-                    }
-                )
-
-    out_dir = Path(config.get("project", {}).get("out_dir", "data/interim"))
-    out_dir.mkdir(parents=True, exist_ok=True)
-
-    summary_path = out_dir / f"cc_scan_summary_{runid}.csv"
-    top_domains_path = out_dir / f"cc_scan_top_domains_{runid}.csv"
+                    domains_total.add(domain)
+
+                matches = find_term_matches(text, patterns, asd_pattern, asd_window)
+                if not matches:
+                    continue
+
+                for label, span in matches:
+                    ledger_cols["crawl_id"].append(crawl_id)
+                    ledger_cols["registered_domain"].append(domain)
+                    ledger_cols["matched_term"].append(label)
+                    ledger_cols["record_ordinal"].append(record_ordinal)
+
+                    if domain:
+                        key = (crawl_id, domain)
+                        if domain_hit_counts[key] >= domain_cap:
+                            continue
+                        domain_hit_counts[key] += 1
+
+                    hit_rows.append(
+                        {
+                            "crawl_id": crawl_id,
+                            "source_wet": source_wet,
+                            "url": url or "",
+                            "registered_domain": domain,
+                            "warc_date": warc_date or "",
+                            "matched_term": label,
+                            "context_snippet": _context_snippet(text, span, asd_window),
+                            "text_len": text_len,
+                        }
+                    )
+
+                if doc_store is not None:
+                    doc_store.add(
+                        source_wet,
+                        url or "",
+                        record_ordinal,
+                        [label for label, _ in matches],
+                        text,
+                    )
+    except BaseException:
+        if doc_store is not None:
+            doc_store.abort()
+        raise
+
+    if doc_store is not None:
+        doc_store.close()
+        logger.info("Wrote doc store %s (%d docs)", doc_store.blocks_path, doc_store.docs_written)
+        logger.info("Wrote doc store index %s", doc_store.index_path)
+
+    ledger = ledger_from_columns(ledger_cols)
+    doc_counts = {
+        "docs_scanned": docs_scanned,
+        "docs_minlen": docs_minlen,
+        "unique_domains_total": len(domains_total),
+    }
+    ledger_path, _ = write_ledger(ledger, doc_counts, out_dir, runid)
+
+    metrics, top_domains = summarize_ledger(ledger, doc_counts, domain_cap)
+    metrics.append(("ledger_parquet", str(ledger_path)))
+    summary_path, top_domains_path = write_summary_outputs(
+        metrics,
+        top_domains,
+        out_dir / f"cc_scan_summary_{runid}.csv",
+        out_dir / f"cc_scan_top_domains_{runid}.csv",
+    )
     parquet_path = out_dir / f"cc_pilot_corpus_{runid}.parquet"
 
-    with summary_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(["metric", "value"])
-        writer.writerow(["docs_scanned", docs_scanned])
-        writer.writerow(["docs_minlen", docs_minlen])
-        writer.writerow(["hits_total", hits_total])
-        writer.writerow(["hits_by_term", json.dumps(hits_by_term)])
-        writer.writerow(["unique_domains_total", len(domains_total)])
-        writer.writerow(["unique_domains_hits", len(domains_hits)])
-        writer.writerow(["capped_removed", capped_removed])
-        writer.writerow(["top_domains_csv", str(top_domains_path)])
-
-    with top_domains_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(["registered_domain", "hits"])
-        for domain, count in top_domains_counter.most_common(25):
-            writer.writerow([domain, count])
-
     df = pd.DataFrame(
         hit_rows,
         columns=[
@@ -232,15 +263,17 @@ def scan_wet_files(config: Dict, config_path: Path) -> Path:
     )
     df.to_parquet(parquet_path, index=False)
 
+    logger.info("Wrote ledger %s (%d matches)", ledger_path, len(ledger))
     logger.info("Wrote summary %s", summary_path)
     logger.info("Wrote top domains %s", top_domains_path)
     logger.info("Wrote corpus %s", parquet_path)
 
+    values = dict(metrics)
     print(
         "Scan complete: "
         f"docs_scanned={docs_scanned}, "
         f"docs_minlen={docs_minlen}, "
-        f"hits_total={hits_total}, "
-        f"unique_domains_hits={len(domains_hits)}"
+        f"hits_total={values['hits_total']}, "
+        f"unique_domains_hits={values['unique_domains_hits']}"
     )
     return summary_path
@@ -0,0 +1,94 @@
+import pandas as pd
+import pytest
+
+from src.data_sources.commoncrawl.cc_docstore import DocStoreReader, DocStoreWriter
+
+
+def test_doc_store_roundtrip_across_blocks(tmp_path):
+    blocks_path = tmp_path / "docs.zst"
+    index_path = tmp_path / "docs_index.parquet"
+    docs = {
+        (idx, "adhd_patterns[0]"): (
+            "a.wet.gz",
+            f"https://example.com/{idx}",
+            f"doc {idx} ADHD " * 50,
+        )
+        for idx in range(20)
+    }
+    docs[(20, "autism_patterns[0]")] = (
+        "b.wet.gz",
+        "https://example.org/ü",
+        "autism – ünïcode",
+    )
+
+    with DocStoreWriter(blocks_path, index_path, block_bytes=2048) as writer:
+        for (record_ordinal, term), (source_wet, url, text) in docs.items():
+            writer.add(source_wet, url, record_ordinal, [term], text)
+
+    index = pd.read_parquet(index_path)
+    assert len(index) == len(docs)
+    assert index["block_offset"].nunique() > 1
+
+    with DocStoreReader(blocks_path, index_path) as reader:
+        for (record_ordinal, term), (source_wet, url, text) in reversed(list(docs.items())):
+            assert reader.get_text(record_ordinal, term) == text
+            assert reader.get_text_by_url(source_wet, url, term) == text
+        with pytest.raises(KeyError):
+            reader.get_text(99, "adhd_patterns[0]")
+
+
+def test_doc_store_shares_text_between_terms(tmp_path):
+    blocks_path = tmp_path / "docs.zst"
+    index_path = tmp_path / "docs_index.parquet"
+    text = "ADHD and autism in one document."
+    terms = ["adhd_patterns[0]", "autism_patterns[0]"]
+
+    with DocStoreWriter(blocks_path, index_path) as writer:
+        writer.add("a.wet.gz", "https://example.com", 0, terms, text)
+
+    assert writer.docs_written == 1
+    with DocStoreReader(blocks_path, index_path) as reader:
+        assert len(reader) == 2
+        assert reader.get_text(0, "adhd_patterns[0]") == text
+        assert reader.get_text(0, "autism_patterns[0]") == text
+
+
+def test_doc_store_repeated_url_keeps_each_record(tmp_path):
+    blocks_path = tmp_path / "docs.zst"
+    index_path = tmp_path / "docs_index.parquet"
+
+    with DocStoreWriter(blocks_path, index_path) as writer:
+        writer.add("a.wet.gz", "", 0, ["adhd_patterns[0]"], "first ADHD doc")
+        writer.add("a.wet.gz", "", 1, ["adhd_patterns[0]"], "second ADHD doc")
+
+    with DocStoreReader(blocks_path, index_path) as reader:
+        assert len(reader) == 2
+        assert reader.get_text(0, "adhd_patterns[0]") == "first ADHD doc"
+        assert reader.get_text(1, "adhd_patterns[0]") == "second ADHD doc"
+        with pytest.raises(ValueError):
+            reader.get_text_by_url("a.wet.gz", "", "adhd_patterns[0]")
+
+
+def test_doc_store_reader_rejects_duplicate_keys(tmp_path):
+    blocks_path = tmp_path / "docs.zst"
+    index_path = tmp_path / "docs_index.parquet"
+
+    with DocStoreWriter(blocks_path, index_path) as writer:
+        writer.add("a.wet.gz", "https://example.com", 0, ["adhd_patterns[0]"], "one")
+        writer.add("a.wet.gz", "https://example.com", 0, ["adhd_patterns[0]"], "two")
+
+    with pytest.raises(ValueError):
+        DocStoreReader(blocks_path, index_path)
+
+
+def test_doc_store_writer_discards_partial_store_on_error(tmp_path):
+    blocks_path = tmp_path / "docs.zst"
+    index_path = tmp_path / "docs_index.parquet"
+
+    with pytest.raises(RuntimeError):
+        with DocStoreWriter(blocks_path, index_path, block_bytes=1) as writer:
+            writer.add("a.wet.gz", "https://example.com", 0, ["adhd_patterns[0]"], "ADHD")
+            raise RuntimeError("scan failed")
+
+    assert not blocks_path.exists()
+    assert not index_path.exists()
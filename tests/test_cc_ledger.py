@@ -0,0 +1,165 @@
+import gzip
+import io
+import json
+from pathlib import Path
+
+import pandas as pd
+from warcio.warcwriter import WARCWriter
+
+from src.data_sources.commoncrawl import cc_scan
+from src.data_sources.commoncrawl.cc_docstore import DocStoreReader
+from src.data_sources.commoncrawl.cc_ledger import (
+    LEDGER_CATEGORY_COLUMNS,
+    apply_domain_cap,
+    find_latest_ledger,
+    ledger_from_columns,
+    read_ledger,
+    recap_ledger,
+    summarize_ledger,
+    write_ledger,
+)
+from src.data_sources.commoncrawl.cc_scan import _context_snippet, scan_wet_files
+
+
+def _ledger() -> pd.DataFrame:
+    return ledger_from_columns(
+        {
+            "crawl_id": ["C1", "C1", "C1", "C2", "C1", "C1"],
+            "registered_domain": ["a.com", "a.com", "", "a.com", "a.com", "b.com"],
+            "matched_term": ["t0", "t1", "t0", "t0", "t0", "t1"],
+            "record_ordinal": [0, 0, 1, 2, 3, 4],
+        }
+    )
+
+
+def test_domain_cap_follows_encounter_order():
+    ledger = _ledger()
+    kept = apply_domain_cap(ledger, domain_cap=1)
+    assert kept.tolist() == [True, False, True, True, False, True]
+
+    reordered = ledger.iloc[[5, 4, 3, 2, 0, 1]]
+    assert apply_domain_cap(reordered, domain_cap=1).sort_index().tolist() == kept.tolist()
+
+
+def test_summarize_ledger_metrics_and_top_domains():
+    doc_counts = {"docs_scanned": 6, "docs_minlen": 5, "unique_domains_total": 3}
+    metrics, top_domains = summarize_ledger(_ledger(), doc_counts, domain_cap=1)
+    values = dict(metrics)
+    assert values["hits_total"] == 4
+    assert values["capped_removed"] == 2
+    assert json.loads(values["hits_by_term"]) == {"t0": 3, "t1": 1}
+    assert values["unique_domains_hits"] == 2
+    assert top_domains.to_dict("records") == [
+        {"registered_domain": "a.com", "hits": 2},
+        {"registered_domain": "b.com", "hits": 1},
+    ]
+
+    _, uncapped_top = summarize_ledger(_ledger(), doc_counts, domain_cap=10)
+    assert uncapped_top.iloc[0].to_dict() == {"registered_domain": "a.com", "hits": 4}
+
+
+def test_ledger_round_trip_keeps_categorical_columns(tmp_path):
+    doc_counts = {"docs_scanned": 6, "docs_minlen": 5, "unique_domains_total": 3}
+    ledger_path, _ = write_ledger(_ledger(), doc_counts, tmp_path, "20260101_000000")
+
+    ledger, _ = read_ledger(ledger_path)
+    for col in LEDGER_CATEGORY_COLUMNS:
+        assert isinstance(ledger[col].dtype, pd.CategoricalDtype)
+    assert ledger["record_ordinal"].dtype == "int64"
+
+
+def test_recap_from_written_ledger(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    out_dir = tmp_path / "interim"
+    out_dir.mkdir()
+    doc_counts = {"docs_scanned": 6, "docs_minlen": 5, "unique_domains_total": 3}
+    ledger_path, _ = write_ledger(_ledger(), doc_counts, out_dir, "20260101_000000")
+
+    assert find_latest_ledger(out_dir) == ledger_path
+    ledger, counts = read_ledger(ledger_path)
+    pd.testing.assert_frame_equal(ledger, _ledger())
+    assert counts == doc_counts
+
+    config = {"project": {"out_dir": str(out_dir)}, "filters": {"domain_cap": 50}}
+    summary_path = recap_ledger(config, ledger_path, domain_cap=1)
+    assert summary_path.name.startswith("cc_recap_summary_")
+    assert summary_path.name.endswith("_cap1.csv")
+    assert not list(out_dir.glob("cc_scan_summary_*.csv"))
+
+    summary = dict(pd.read_csv(summary_path).itertuples(index=False))
+    assert summary["hits_total"] == "4"
+    assert summary["capped_removed"] == "2"
+    assert summary["ledger_parquet"] == str(ledger_path)
+    top_domains = pd.read_csv(summary["top_domains_csv"])
+    assert top_domains["hits"].tolist() == [2, 1]
+
+
+def _write_wet(path, records):
+    buf = io.BytesIO()
+    writer = WARCWriter(buf, gzip=False)
+    for url, text in records:
+        record = writer.create_warc_record(
+            url, "conversion", payload=io.BytesIO(text.encode("utf-8"))
+        )
+        writer.write_record(record)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(gzip.compress(buf.getvalue()))
+
+
+def test_scan_corpus_and_doc_store_align_with_ledger(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    records = [
+        ("https://a.com/1", "ADHD and autism " * 40),
+        ("https://a.com/2", "Another ADHD page " * 40),
+        ("https://b.com/1", "autistic adults " * 40),
+        ("https://a.com/1", "The same URL again, ADHD " * 30),
+        ("https://a.com/3", "too short ADHD"),
+    ]
+    _write_wet(tmp_path / "data/raw/wet/CC-MAIN-2020-01_001.wet.gz", records)
+    config = {
+        "project": {"out_dir": "interim"},
+        "filters": {"min_chars": 100, "domain_cap": 2, "asd_disambiguation_window_chars": 50},
+        "terms": {
+            "adhd_patterns": [r"\badhd\b"],
+            "autism_patterns": [r"\bautism\b", r"\bautistic\b"],
+        },
+        "doc_store": {"enabled": True},
+    }
+
+    snippet_calls = []
+
+    def counting_snippet(text, span, window):
+        snippet_calls.append(span)
+        return _context_snippet(text, span, window)
+
+    monkeypatch.setattr(cc_scan, "_context_snippet", counting_snippet)
+
+    summary_path = scan_wet_files(config, Path("config.yaml"))
+    runid = summary_path.name[len("cc_scan_summary_") : -len(".csv")]
+    out_dir = tmp_path / "interim"
+
+    ledger, counts = read_ledger(out_dir / f"cc_scan_ledger_{runid}.parquet")
+    assert counts == {"docs_scanned": 5, "docs_minlen": 4, "unique_domains_total": 2}
+    assert len(ledger) == 5
+    for col in LEDGER_CATEGORY_COLUMNS:
+        assert isinstance(ledger[col].dtype, pd.CategoricalDtype)
+
+    kept = ledger[apply_domain_cap(ledger, domain_cap=2)]
+    corpus = pd.read_parquet(out_dir / f"cc_pilot_corpus_{runid}.parquet")
+    cols = ["crawl_id", "registered_domain", "matched_term"]
+    pd.testing.assert_frame_equal(
+        corpus[cols].reset_index(drop=True), kept[cols].astype(str).reset_index(drop=True)
+    )
+    # Capped matches are recorded in the ledger but never build a corpus row.
+    assert len(snippet_calls) == len(corpus) == 3
+    assert corpus["url"].tolist() == ["https://a.com/1", "https://a.com/1", "https://b.com/1"]
+
+    recapped = ledger[apply_domain_cap(ledger, domain_cap=10)]
+    with DocStoreReader(
+        out_dir / f"cc_hit_docs_{runid}.zst", out_dir / f"cc_hit_docs_index_{runid}.parquet"
+    ) as reader:
+        texts = [
+            reader.get_text(row.record_ordinal, row.matched_term)
+            for row in recapped.itertuples(index=False)
+        ]
+    assert texts == [records[ordinal][1] for ordinal in recapped["record_ordinal"]]